@@ -13,6 +13,27 @@ import { cn } from '@/lib/utils';
 // API base URL for the AI backend
 const AI_BACKEND_URL = process.env.NEXT_PUBLIC_ORBIT_AI_URL || 'http://localhost:8002';
 
+// Attempts per chat send; only network failures are retried
+const CHAT_SEND_ATTEMPTS = 2;
+
+// POST a chat message. Every attempt carries the same request_id, so a retry
+// of a send that did reach the backend gets the original reply back instead
+// of being processed as a second turn.
+async function postChat(body: Record<string, unknown>): Promise<Response> {
+  const payload = JSON.stringify({ ...body, request_id: crypto.randomUUID() });
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await fetch(`${AI_BACKEND_URL}/api/orbit-ai/chat`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: payload,
+      });
+    } catch (err) {
+      if (attempt >= CHAT_SEND_ATTEMPTS) throw err;
+    }
+  }
+}
+
 // Simple markdown parser for bold text
 function parseMarkdown(text: string): React.ReactNode[] {
   const parts = text.split(/(\*\*[^*]+\*\*)/);
@@ -132,15 +153,11 @@ export function OrbitBuilderChat({ onDeploymentStart, className }: OrbitBuilderC
   const initSession = async (sid: string) => {
     // The first message will initialize the session
     try {
-      const response = await fetch(`${AI_BACKEND_URL}/api/orbit-ai/chat`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          session_id: sid,
-          message: 'hello',
-          wallet_address: walletAddress,
-          user_id: user?.id,
-        }),
+      const response = await postChat({
+        session_id: sid,
+        message: 'hello',
+        wallet_address: walletAddress,
+        user_id: user?.id,
       });
       
       if (!response.ok) throw new Error('Failed to initialize session');
@@ -411,15 +428,11 @@ export function OrbitBuilderChat({ onDeploymentStart, className }: OrbitBuilderC
     setIsLoading(true);
     
     try {
-      const response = await fetch(`${AI_BACKEND_URL}/api/orbit-ai/chat`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          session_id: sessionId,
-          message: text,
-          wallet_address: walletAddress,
-          user_id: user?.id,
-        }),
+      const response = await postChat({
+        session_id: sessionId,
+        message: text,
+        wallet_address: walletAddress,
+        user_id: user?.id,
       });
       
       if (!response.ok) {
@@ -1,9 +1,11 @@
 """
 LLM orchestration with Groq (primary) and Gemini (fallback).
 """
+import asyncio
+import functools
 import os
 import logging
-from typing import Optional
+from typing import AsyncIterator, Callable, Iterator, Optional
 
 from groq import Groq
 import google.generativeai as genai
@@ -52,16 +54,15 @@ class AIEngine:
         else:
             logger.warning("GEMINI_API_KEY not set")
     
-    async def generate_response(
+    def _build_messages(
         self,
         user_message: str,
         phase: str,
         current_step: str,
         collected_params: dict,
         message_history: list[dict],
-    ) -> str:
-        """Generate AI response using Groq with Gemini fallback."""
-        
+    ) -> tuple[list[dict], str]:
+        """Build the LLM messages and the default step question for a turn."""
         system_prompt = get_system_prompt(phase, current_step, collected_params)
         
         # Build messages for LLM
@@ -72,12 +73,9 @@ class AIEngine:
             messages.append({"role": "user", "content": example["user"]})
             messages.append({"role": "assistant", "content": example["assistant"]})
         
-        # Add conversation history (last 10 messages)
-        for msg in message_history[-10:]:
-            messages.append({
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", ""),
-            })
+        # Add conversation history (last 10 messages); the session already
+        # keeps these as {role, content} dicts, so reuse them as-is
+        messages.extend(message_history[-10:])
         
         # Add current user message
         messages.append({"role": "user", "content": user_message})
@@ -98,6 +96,20 @@ class AIEngine:
             "role": "system",
             "content": " ".join(filter(None, context_parts)),
         })
+        return messages, step_question
+    
+    async def generate_response(
+        self,
+        user_message: str,
+        phase: str,
+        current_step: str,
+        collected_params: dict,
+        message_history: list[dict],
+    ) -> str:
+        """Generate AI response using Groq with Gemini fallback."""
+        messages, step_question = self._build_messages(
+            user_message, phase, current_step, collected_params, message_history
+        )
         
         # Try Groq first - cycle through all available keys
         if self.groq_clients:
@@ -144,6 +156,71 @@ class AIEngine:
         logger.warning("Both LLMs failed, using default question")
         return step_question
     
+    async def stream_response(
+        self,
+        user_message: str,
+        phase: str,
+        current_step: str,
+        collected_params: dict,
+        message_history: list[dict],
+    ) -> AsyncIterator[str]:
+        """Stream the AI response as it is generated, with the same fallbacks.
+        
+        A Groq client that fails before producing any text falls through to
+        the next one; once text has been sent it cannot be retracted, so a
+        failure mid-stream ends the response.
+        """
+        messages, step_question = self._build_messages(
+            user_message, phase, current_step, collected_params, message_history
+        )
+        
+        for i, client in enumerate(self.groq_clients, 1):
+            streamed = False
+            try:
+                logger.info(f"Streaming from Groq client {i}/{len(self.groq_clients)}")
+                async for chunk in self._stream_groq(client, messages):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                logger.error(f"Groq client {i} stream error: {e}")
+                if streamed:
+                    return
+                continue
+            if streamed:
+                logger.info(f"Groq client {i} succeeded")
+                return
+        
+        # Gemini and the default question are sent as a single chunk
+        if self.gemini_model:
+            try:
+                response = await self._call_gemini(messages)
+                if response:
+                    yield response
+                    return
+            except Exception as e:
+                logger.error(f"Gemini error: {e}")
+        
+        logger.warning("Both LLMs failed, using default question")
+        yield step_question
+    
+    async def _stream_groq(self, client: Groq, messages: list[dict]) -> AsyncIterator[str]:
+        """Stream content deltas from the Groq API with a specific client."""
+        def call() -> Iterator[str]:
+            stream = client.chat.completions.create(
+                model="moonshotai/kimi-k2-instruct-0905",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=800,
+                stream=True,
+            )
+            for chunk in stream:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    yield content
+        
+        async for content in _iterate_in_thread(call):
+            yield content
+    
     async def _call_groq(self, client: Groq, messages: list[dict]) -> Optional[str]:
         """Call Groq API with a specific client."""
         if not client:
@@ -198,13 +275,29 @@ class AIEngine:
         return get_step_question("use_case")
 
 
-# Singleton instance
-_ai_engine: Optional[AIEngine] = None
+async def _iterate_in_thread(make_iter: Callable[[], Iterator[str]]) -> AsyncIterator[str]:
+    """Drain a blocking iterator on the default executor, yielding items as they arrive."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    
+    def pump():
+        try:
+            for item in make_iter():
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+    
+    loop.run_in_executor(None, pump)
+    while (item := await queue.get()) is not done:
+        if isinstance(item, Exception):
+            raise item
+        yield item
 
 
+@functools.lru_cache(maxsize=None)
 def get_ai_engine() -> AIEngine:
     """Get or create the AI engine singleton."""
-    global _ai_engine
-    if _ai_engine is None:
-        _ai_engine = AIEngine()
-    return _ai_engine
+    return AIEngine()
@@ -1,6 +1,7 @@
 """
 Config builder: transforms collected params into complete OrbitConfig.
 """
+import functools
 import logging
 from typing import Optional
 
@@ -8,8 +9,8 @@ from models.orbit_config import (
     OrbitConfig,
     ChainConfig,
     NativeToken,
-    DataAvailabilityMode,
-    ParentChain,
+    DATA_AVAILABILITY_MODES,
+    PARENT_CHAINS,
 )
 from models.conversation import ConversationSession
 from utils.validators import generate_chain_id
@@ -33,27 +34,38 @@ class ConfigBuilder:
         if not params:
             return None
         
+        # Generated once and kept with the params, so every rebuild (including
+        # one on another worker or after a restart) keeps the reviewed chain ID
+        chain_id = params.get("_chain_id")
+        if chain_id is None:
+            chain_id = params["_chain_id"] = generate_chain_id()
+        
+        # Reuse the last build while the inputs are unchanged
+        cache_key = hash((
+            session.wallet_address,
+            tuple(sorted((k, repr(v)) for k, v in params.items())),
+        ))
+        if session._config_cache_key == cache_key:
+            return session._config_cache
+        session._backend_config_cache = None
+        
         # Get use case preset for defaults
         use_case = params.get("use_case", "general")
         preset = get_preset(use_case)
         defaults = preset.get("defaults", {})
         
         # Extract values with defaults
-        chain_name = params.get("chain_name", f"orbit-chain-{generate_chain_id()}")
+        chain_name = params.get("chain_name", f"orbit-chain-{chain_id}")
         
         # Parent chain
-        parent_chain_str = params.get("parent_chain", "arbitrum-sepolia")
-        try:
-            parent_chain = ParentChain(parent_chain_str)
-        except ValueError:
-            parent_chain = ParentChain.ARBITRUM_SEPOLIA
+        parent_chain = params.get("parent_chain", "arbitrum-sepolia")
+        if parent_chain not in PARENT_CHAINS:
+            parent_chain = "arbitrum-sepolia"
         
         # Data availability
-        da_str = params.get("data_availability", defaults.get("data_availability", "anytrust"))
-        try:
-            data_availability = DataAvailabilityMode(da_str)
-        except ValueError:
-            data_availability = DataAvailabilityMode.ANYTRUST
+        data_availability = params.get("data_availability", defaults.get("data_availability", "anytrust"))
+        if data_availability not in DATA_AVAILABILITY_MODES:
+            data_availability = "anytrust"
         
         # Validators
         validator_count = params.get("validators", defaults.get("validators", 3))
@@ -91,9 +103,6 @@ class ConfigBuilder:
             challenge_period_days=challenge_period,
         )
         
-        # Generate chain ID
-        chain_id = generate_chain_id()
-        
         # Build complete config
         try:
             config = OrbitConfig(
@@ -106,29 +115,37 @@ class ConfigBuilder:
                 chain_config=chain_config,
                 use_case=use_case,
             )
+            session._config_cache_key = cache_key
+            session._config_cache = config
             return config
         except Exception as e:
             logger.error(f"Failed to build config: {e}")
             return None
     
+    def build_backend_config(self, session: ConversationSession) -> Optional[dict]:
+        """Build the config in backend format, reused while params are unchanged."""
+        config = self.build_from_session(session)
+        if config is None:
+            return None
+        if session._backend_config_cache is None:
+            session._backend_config_cache = config.to_backend_format()
+        return session._backend_config_cache
+    
     def format_config_summary(self, config: OrbitConfig) -> str:
         """Format config as a summary string for display."""
-        lines = [
-            f"┌─────────────────────────────────────────┐",
-            f"│  {config.chain_config.chain_name} L3 Chain",
-            f"├─────────────────────────────────────────┤",
-            f"│  Chain ID:        {config.chain_id:,}",
-            f"│  Parent Chain:    {config.parent_chain.value.replace('-', ' ').title()}",
-            f"│  DA Mode:         {config.data_availability.value.title()}",
-            f"│  Block Time:      {config.chain_config.block_time} second(s)",
-            f"│  Gas Limit:       {config.chain_config.gas_limit:,}",
-            f"│  Validators:      {len(config.validators)}",
-            f"│  Native Token:    {config.chain_config.native_token.symbol}",
-            f"│  Challenge Period: {config.chain_config.challenge_period_days} days",
-            f"│  Owner:           {config.owner_address[:10]}...{config.owner_address[-6:]}",
-            f"└─────────────────────────────────────────┘",
-        ]
-        return "\n".join(lines)
+        chain_config = config.chain_config
+        return _format_summary(
+            chain_config.chain_name,
+            config.chain_id,
+            config.parent_chain,
+            config.data_availability,
+            chain_config.block_time,
+            chain_config.gas_limit,
+            len(config.validators),
+            chain_config.native_token.symbol,
+            chain_config.challenge_period_days,
+            config.owner_address,
+        )
     
     def validate_config(self, config: OrbitConfig) -> tuple[bool, list[str]]:
         """Validate a config and return (is_valid, errors)."""
@@ -153,13 +170,53 @@ class ConfigBuilder:
         return (len(errors) == 0, errors)
 
 
-# Singleton instance
-_config_builder: Optional[ConfigBuilder] = None
+_SUMMARY_TEMPLATE = (
+    "┌─────────────────────────────────────────┐\n"
+    "│  {chain_name} L3 Chain\n"
+    "├─────────────────────────────────────────┤\n"
+    "│  Chain ID:        {chain_id:,}\n"
+    "│  Parent Chain:    {parent_chain}\n"
+    "│  DA Mode:         {data_availability}\n"
+    "│  Block Time:      {block_time} second(s)\n"
+    "│  Gas Limit:       {gas_limit:,}\n"
+    "│  Validators:      {validator_count}\n"
+    "│  Native Token:    {token_symbol}\n"
+    "│  Challenge Period: {challenge_period_days} days\n"
+    "│  Owner:           {owner_head}...{owner_tail}\n"
+    "└─────────────────────────────────────────┘"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _format_summary(
+    chain_name: str,
+    chain_id: int,
+    parent_chain: str,
+    data_availability: str,
+    block_time: int,
+    gas_limit: int,
+    validator_count: int,
+    token_symbol: str,
+    challenge_period_days: int,
+    owner_address: str,
+) -> str:
+    """Render the config summary box (cached on the displayed fields)."""
+    return _SUMMARY_TEMPLATE.format_map({
+        "chain_name": chain_name,
+        "chain_id": chain_id,
+        "parent_chain": parent_chain.replace("-", " ").title(),
+        "data_availability": data_availability.title(),
+        "block_time": block_time,
+        "gas_limit": gas_limit,
+        "validator_count": validator_count,
+        "token_symbol": token_symbol,
+        "challenge_period_days": challenge_period_days,
+        "owner_head": owner_address[:10],
+        "owner_tail": owner_address[-6:],
+    })
 
 
+@functools.lru_cache(maxsize=None)
 def get_config_builder() -> ConfigBuilder:
     """Get or create the config builder singleton."""
-    global _config_builder
-    if _config_builder is None:
-        _config_builder = ConfigBuilder()
-    return _config_builder
+    return ConfigBuilder()
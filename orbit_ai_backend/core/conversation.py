@@ -1,11 +1,15 @@
 """
 Conversation state machine and session management.
 """
+import asyncio
+import contextlib
+import functools
+import re
 import uuid
 import time
 import logging
-from datetime import datetime
-from typing import Optional
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
 
 from models.conversation import (
     ConversationSession,
@@ -27,17 +31,146 @@ from utils.validators import (
 from utils.defaults import get_preset, generate_validators, get_default_value
 from .ai_engine import get_ai_engine
 from .prompts import get_step_question
+from .session_store import SessionStore, create_session_store
 
 logger = logging.getLogger(__name__)
 
+# Recently served replies kept for retry deduplication
+_REPLY_CACHE_SIZE = 256
+
+_ETH_ADDR_RE = re.compile(r"0x[a-fA-F0-9]{40}")
+_GAS_NUM_RE = re.compile(r"\b(\d{7,9})\b")
+
+# Keyword tables used by the intent/extraction helpers
+_BACK_COMMANDS = frozenset({"go back", "back", "previous", "undo"})
+
+_CASUAL_MESSAGES = frozenset({
+    "hi", "hello", "hey", "hola", "sup", "yo",
+    "what's up", "whats up", "wassup",
+    "good morning", "good afternoon", "good evening",
+    "how are you", "how's it going", "how are things",
+    "thanks", "thank you", "thx",
+    "ok", "okay", "cool", "nice", "great", "awesome",
+    "hmm", "um", "uh", "err",
+    "help", "what", "huh", "?",
+    "test", "testing", "asdf", "aaa", "bbb",
+})
+
+# Longer messages can never be an exact casual match
+_CASUAL_MAX_LEN = max(map(len, _CASUAL_MESSAGES))
+
+# Checked in one C-level call via str.startswith(tuple)
+_GREETING_STARTERS = ("hi ", "hey ", "hello ", "yo ")
+
+# Intent patterns: keyword → ConfigStep mapping
+_INTENT_SIGNALS = {
+    ConfigStep.PARENT_CHAIN: (
+        "mainnet", "testnet", "sepolia", "arbitrum one",
+        "arbitrum nova", "production", "main net",
+    ),
+    ConfigStep.DATA_AVAILABILITY: (
+        "anytrust", "any trust", "rollup", "roll up", "roll-up",
+        "data availability", "full rollup", "full security",
+        "ethereum da", "dac committee",
+    ),
+    ConfigStep.VALIDATORS: (
+        "validator",
+    ),
+    ConfigStep.OWNER_ADDRESS: (
+        "0x", "my wallet", "connected wallet", "my address",
+    ),
+    ConfigStep.NATIVE_TOKEN: (
+        "custom token", "native token", "gas token",
+    ),
+}
+
+# Flattened (keyword, keyword chars, step) entries in table order, so the
+# step listed first still wins when a message mentions several. The char set
+# lets a keyword be skipped without a substring scan when the message lacks
+# any of its characters.
+_INTENT_BY_KW = tuple(
+    (kw, frozenset(kw), step) for step, kws in _INTENT_SIGNALS.items() for kw in kws
+)
+
+
+def _keyword_search(keywords):
+    """Compile keywords into one alternation so a message is scanned in a single pass."""
+    return re.compile("|".join(map(re.escape, sorted(keywords, key=lambda kw: (-len(kw), kw))))).search
+
+
+_USE_CASE_KEYWORDS = frozenset({"app", "chain", "project", "build", "create", "making", "platform"})
+
+# Messages containing these are about other config steps, not a chain name
+_CONFIG_KEYWORDS = frozenset({
+    "mainnet", "testnet", "sepolia", "nova", "arbitrum",
+    "rollup", "anytrust", "trust",
+    "validator", "eth", "ether", "custom token",
+    "wallet", "address", "0x",
+    "second", "fast", "slow",
+    "million", "gas",
+    "days", "week", "challenge",
+    "production", "deploy",
+})
+
+_has_use_case_keyword = _keyword_search(_USE_CASE_KEYWORDS)
+_has_config_keyword = _keyword_search(_CONFIG_KEYWORDS)
+
+_SKIP_WORDS = frozenset({"the", "a", "an", "is", "be", "it"})
+
+_YES_WORDS = frozenset({"yes", "yeah", "ok", "sure", "sounds good", "yep"})
+_DA_CONFIRMATIONS = _YES_WORDS | {"that's fine", "works for me"}
+
+_ROLLUP_PATTERNS = ("rollup", "roll up", "roll-up", "ethereum da", "full rollup", "full security")
+_ANYTRUST_PATTERNS = ("anytrust", "any trust", "any-trust", "cheaper", "fast", "dac")
+_has_rollup_pattern = _keyword_search(_ROLLUP_PATTERNS)
+_has_anytrust_pattern = _keyword_search(_ANYTRUST_PATTERNS)
+
 
 class ConversationManager:
-    """Manages conversation sessions with TTL expiration."""
+    """Manages conversation sessions with TTL expiration and an LRU size cap."""
     
-    def __init__(self, ttl_seconds: int = 7200):
-        self.sessions: dict[str, ConversationSession] = {}
-        self.session_timestamps: dict[str, float] = {}
+    def __init__(
+        self,
+        ttl_seconds: int = 7200,
+        reply_dedup_seconds: float = 30.0,
+        max_sessions: int = 10_000,
+        cleanup_interval_seconds: float = 60.0,
+        store: Optional[SessionStore] = None,
+    ):
+        # session_id -> (session, last touched). Every touch moves the entry
+        # to the end, so entries are ordered oldest-first by timestamp.
+        # With a store configured this is only a hot cache in front of it.
+        self.sessions: OrderedDict[str, tuple[ConversationSession, float]] = OrderedDict()
+        self.store = store
         self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self.reply_dedup_seconds = reply_dedup_seconds
+        
+        # Serializes turns within a session; different sessions run concurrently.
+        # Session-map mutations themselves are synchronous, so they never
+        # interleave on the event loop and need no lock of their own.
+        # Locks only live while a turn holds or awaits them, so the table is
+        # bounded by in-flight requests rather than by sessions.
+        self._session_locks: dict[str, asyncio.Lock] = {}
+        self._session_lock_users: dict[str, int] = {}
+        
+        # (session_id, client request ID) -> (served_at, reply message)
+        self._recent_replies: OrderedDict[tuple[str, str], tuple[float, Message]] = OrderedDict()
+        
+        # Per-step value extractors used by _extract_value
+        self._extractors = {
+            ConfigStep.USE_CASE: self._extract_use_case,
+            ConfigStep.CHAIN_NAME: self._extract_chain_name,
+            ConfigStep.PARENT_CHAIN: self._extract_parent_chain,
+            ConfigStep.DATA_AVAILABILITY: self._extract_data_availability,
+            ConfigStep.VALIDATORS: self._extract_validators,
+            ConfigStep.OWNER_ADDRESS: self._extract_owner_address,
+            ConfigStep.NATIVE_TOKEN: self._extract_native_token,
+            ConfigStep.BLOCK_TIME: self._extract_block_time,
+            ConfigStep.GAS_LIMIT: self._extract_gas_limit,
+            ConfigStep.CHALLENGE_PERIOD: self._extract_challenge_period,
+        }
     
     def create_session(
         self,
@@ -46,14 +179,14 @@ class ConversationManager:
         wallet_address: Optional[str] = None,
     ) -> ConversationSession:
         """Create a new conversation session."""
-        self._cleanup_expired()
-        
         if session_id is None:
             session_id = str(uuid.uuid4())
         
         # If session exists, return it
-        if session_id in self.sessions:
-            return self.sessions[session_id]
+        entry = self.sessions.get(session_id)
+        if entry:
+            self._touch(session_id, entry[0])
+            return entry[0]
         
         session = ConversationSession(
             session_id=session_id,
@@ -63,46 +196,174 @@ class ConversationManager:
         
         # Add greeting message
         greeting = get_ai_engine().get_greeting()
-        session.messages.append(Message(
-            id=str(uuid.uuid4()),
+        session.add_message(Message(
+            id=session.next_message_id(),
             role="assistant",
             content=greeting,
         ))
         
-        self.sessions[session_id] = session
-        self.session_timestamps[session_id] = time.time()
+        self._touch(session_id, session)
+        self.save_session(session)
+        
+        # Evict the least recently used sessions beyond the cap
+        while len(self.sessions) > self.max_sessions:
+            evicted_id, _ = self.sessions.popitem(last=False)
+            logger.info(f"Evicted least recently used session {evicted_id}")
         
         return session
     
     def get_session(self, session_id: str) -> Optional[ConversationSession]:
         """Get an existing session by ID."""
-        self._cleanup_expired()
+        entry = self.sessions.get(session_id)
+        session = entry[0] if entry else None
         
-        if session_id in self.sessions:
-            self.session_timestamps[session_id] = time.time()  # Touch
-            return self.sessions[session_id]
+        if self.store:
+            # Reload when another worker has moved the session on since we cached it
+            newer_than = max(session.updated_at if session else 0.0, time.time() - self.ttl_seconds)
+            session = self.store.load(session_id, newer_than) or session
         
-        return None
+        if session:
+            self._touch(session_id, session)
+        return session
     
-    def reset_session(self, session_id: str) -> ConversationSession:
-        """Reset a session to start over."""
-        if session_id in self.sessions:
-            old = self.sessions[session_id]
-            del self.sessions[session_id]
-            return self.create_session(
-                session_id=session_id,
-                user_id=old.user_id,
-                wallet_address=old.wallet_address,
-            )
-        return self.create_session(session_id=session_id)
+    def save_session(self, session: ConversationSession) -> None:
+        """Stamp a session as updated and write it through to the store."""
+        session.updated_at = time.time()
+        if self.store:
+            self.store.save(session)
+    
+    def _touch(self, session_id: str, session: ConversationSession) -> None:
+        """Mark a session as most recently used."""
+        self.sessions[session_id] = (session, time.time())
+        self.sessions.move_to_end(session_id)
+    
+    async def reset_session(self, session_id: str) -> ConversationSession:
+        """Reset a session to start over.
+        
+        Waits for any in-flight turn, which would otherwise save the old
+        session over the fresh one when it finishes.
+        """
+        async with self._session_turn(session_id):
+            old = self.get_session(session_id)
+            if old:
+                del self.sessions[session_id]
+                return self.create_session(
+                    session_id=session_id,
+                    user_id=old.user_id,
+                    wallet_address=old.wallet_address,
+                )
+            return self.create_session(session_id=session_id)
     
     async def process_message(
         self,
         session_id: str,
         user_message: str,
         wallet_address: Optional[str] = None,
+        request_id: Optional[str] = None,
     ) -> ConversationSession:
-        """Process a user message and generate AI response."""
+        """Process a user message and generate AI response.
+        
+        A client-supplied `request_id` makes the call idempotent: a retry
+        with the same ID gets the original reply instead of a new turn.
+        """
+        async with self._session_turn(session_id):
+            reply_key = (session_id, request_id) if request_id else None
+            session = self._get_answered_session(session_id, reply_key)
+            if session:
+                return session
+            
+            session, ai_response = self._apply_user_message(session_id, user_message, wallet_address)
+            if ai_response is None:
+                ai_response = await get_ai_engine().generate_response(
+                    **self._llm_request(session, user_message)
+                )
+            
+            self._finish_turn(session, reply_key, ai_response)
+            return session
+    
+    async def process_message_stream(
+        self,
+        session_id: str,
+        user_message: str,
+        wallet_address: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Process a user message, yielding the AI response as it is generated.
+        
+        The full reply is only added to the session once the stream finishes.
+        If the client disconnects mid-stream the turn still finishes, with
+        whatever text was produced by then.
+        """
+        async with self._session_turn(session_id):
+            reply_key = (session_id, request_id) if request_id else None
+            session = self._get_answered_session(session_id, reply_key)
+            if session:
+                yield session.messages[-1].content
+                return
+            
+            session, ai_response = self._apply_user_message(session_id, user_message, wallet_address)
+            chunks = []
+            try:
+                if ai_response is None:
+                    async for chunk in get_ai_engine().stream_response(
+                        **self._llm_request(session, user_message)
+                    ):
+                        chunks.append(chunk)
+                        yield chunk
+                else:
+                    chunks.append(ai_response)
+                    yield ai_response
+            finally:
+                # The user message is already applied, so always pair it with a reply
+                self._finish_turn(session, reply_key, "".join(chunks))
+    
+    @contextlib.asynccontextmanager
+    async def _session_turn(self, session_id: str):
+        """Hold the session's lock for the duration of one turn."""
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        self._session_lock_users[session_id] = self._session_lock_users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            users = self._session_lock_users[session_id] - 1
+            if users:
+                self._session_lock_users[session_id] = users
+            else:
+                del self._session_lock_users[session_id]
+                del self._session_locks[session_id]
+    
+    def _get_answered_session(
+        self,
+        session_id: str,
+        reply_key: Optional[tuple[str, str]],
+    ) -> Optional[ConversationSession]:
+        """Return the session if this request is a retry of the turn just answered."""
+        # Without a client request ID a repeated message is a new turn
+        # (e.g. "yes" to two questions in a row), so nothing is deduplicated
+        served = self._recent_replies.get(reply_key) if reply_key else None
+        if not served:
+            return None
+        
+        # A retry of the request we just answered gets the same reply back,
+        # as long as nothing else has happened in the session since
+        session = self.get_session(session_id)
+        served_at, reply = served
+        if session and time.time() - served_at < self.reply_dedup_seconds and session.messages[-1] is reply:
+            logger.info(f"Duplicate message for session {session_id}, returning previous reply")
+            return session
+        return None
+    
+    def _apply_user_message(
+        self,
+        session_id: str,
+        user_message: str,
+        wallet_address: Optional[str],
+    ) -> tuple[ConversationSession, Optional[str]]:
+        """Record the user's message and update config state.
+        
+        Returns the session and, for turns that need no LLM call, the reply.
+        """
         session = self.get_session(session_id)
         if not session:
             session = self.create_session(session_id, wallet_address=wallet_address)
@@ -112,33 +373,31 @@ class ConversationManager:
             session.wallet_address = wallet_address
         
         # Add user message
-        session.messages.append(Message(
-            id=str(uuid.uuid4()),
+        session.add_message(Message(
+            id=session.next_message_id(),
             role="user",
             content=user_message,
         ))
         
-        # Check for commands
-        lower_msg = user_message.lower().strip()
+        # Lowercase once and share with the intent/extraction helpers
+        msg_lower = user_message.lower().strip()
         
         # Go back command
-        if lower_msg in ["go back", "back", "previous", "undo"]:
+        if msg_lower in _BACK_COMMANDS:
             if session.go_back_step():
-                ai_response = f"No problem! Let's go back.\n\n{get_step_question(session.current_step.value, session.collected_params)}"
-            else:
-                ai_response = "We're already at the first step. Let's continue from here."
-            
-            session.messages.append(Message(
-                id=str(uuid.uuid4()),
-                role="assistant",
-                content=ai_response,
-            ))
-            return session
+                return session, f"No problem! Let's go back.\n\n{get_step_question(session.current_step.value, session.collected_params)}"
+            return session, "We're already at the first step. Let's continue from here."
+        
+        # Casual chat never sets a config value, so it skips both intent
+        # detection and extraction
+        is_casual = self._is_casual_message(msg_lower)
+        if is_casual:
+            logger.info(f"Message '{user_message}' detected as casual, skipping extraction")
         
         # Cross-step intent detection: check if the user's response
         # matches a DIFFERENT step better than the current one.
         # This fixes desync when the AI asks about steps out of order.
-        target_step = self._detect_intent_step(session, user_message)
+        target_step = None if is_casual else self._detect_intent_step(session, msg_lower)
         original_step = session.current_step
         
         if target_step and target_step != session.current_step:
@@ -146,29 +405,22 @@ class ConversationManager:
             logger.info(f"Cross-step detection: user message matches {target_step.value} instead of current {session.current_step.value}")
             saved_step = session.current_step
             session.current_step = target_step
-            extracted = self._extract_value(session, user_message)
+            extracted = self._extract_value(session, user_message, msg_lower)
             if extracted:
                 session.collected_params[target_step.value] = extracted
                 logger.info(f"Cross-step extracted: {target_step.value} = {extracted}")
-                defaults_list = session.collected_params.get("_defaults", [])
-                if target_step.value in defaults_list:
-                    defaults_list.remove(target_step.value)
-                    session.collected_params["_defaults"] = defaults_list
+                self._mark_confirmed(session, target_step.value)
             # Restore to original step (don't advance from a different step)
             session.current_step = saved_step
         else:
             # Normal flow: extract for the current step
-            extracted = self._extract_value(session, user_message)
+            extracted = None if is_casual else self._extract_value(session, user_message, msg_lower)
             
             if extracted:
                 session.collected_params[session.current_step.value] = extracted
                 logger.info(f"Extracted for {session.current_step.value}: {extracted}")
-                # Mark this param as user-confirmed (remove from defaults list)
-                defaults_list = session.collected_params.get("_defaults", [])
-                step_key = session.current_step.value
-                if step_key in defaults_list:
-                    defaults_list.remove(step_key)
-                    session.collected_params["_defaults"] = defaults_list
+                # Mark this param as user-confirmed (remove from defaults set)
+                self._mark_confirmed(session, session.current_step.value)
                 
                 # Transition to configuration phase after first extraction
                 if session.phase == ConversationPhase.GREETING:
@@ -183,26 +435,27 @@ class ConversationManager:
                     session.phase = ConversationPhase.REVIEW
                     logger.info("Phase transitioned to REVIEW")
         
-        # Get AI response
-        ai_engine = get_ai_engine()
-        
-        # Build message history for AI
-        msg_history = [
-            {"role": m.role, "content": m.content}
-            for m in session.messages[-10:]
-        ]
-        
-        ai_response = await ai_engine.generate_response(
-            user_message=user_message,
-            phase=session.phase.value,
-            current_step=session.current_step.value,
-            collected_params=session.collected_params,
-            message_history=msg_history,
-        )
-        
-        # Add AI response
-        session.messages.append(Message(
-            id=str(uuid.uuid4()),
+        return session, None
+    
+    def _llm_request(self, session: ConversationSession, user_message: str) -> dict:
+        """Build the AI engine arguments for the current turn."""
+        return {
+            "user_message": user_message,
+            "phase": session.phase.value,
+            "current_step": session.current_step.value,
+            "collected_params": session.collected_params,
+            "message_history": session.get_recent_history(),
+        }
+    
+    def _finish_turn(
+        self,
+        session: ConversationSession,
+        reply_key: Optional[tuple[str, str]],
+        ai_response: str,
+    ) -> None:
+        """Add the AI reply, persist the session and remember the reply."""
+        session.add_message(Message(
+            id=session.next_message_id(),
             role="assistant",
             content=ai_response,
         ))
@@ -210,281 +463,254 @@ class ConversationManager:
         # Log final state before returning
         logger.info(f"Session state before return: step={session.current_step.value}, collected_params={session.collected_params}")
         
-        session.updated_at = datetime.utcnow()
-        return session
+        self.save_session(session)
+        if reply_key:
+            self._remember_reply(reply_key, session)
+    
+    def _remember_reply(self, reply_key: tuple[str, str], session: ConversationSession) -> None:
+        """Record a served reply for retry deduplication (bounded LRU)."""
+        self._recent_replies[reply_key] = (time.time(), session.messages[-1])
+        self._recent_replies.move_to_end(reply_key)
+        while len(self._recent_replies) > _REPLY_CACHE_SIZE:
+            self._recent_replies.popitem(last=False)
+    
+    def _mark_confirmed(self, session: ConversationSession, step_key: str) -> None:
+        """Drop a param from the pre-filled defaults once the user has set it."""
+        defaults = session.collected_params.get("_defaults")
+        if defaults:
+            defaults.discard(step_key)
     
-    def _detect_intent_step(self, session: ConversationSession, message: str) -> Optional[ConfigStep]:
+    def _detect_intent_step(self, session: ConversationSession, msg_lower: str) -> Optional[ConfigStep]:
         """Detect if the user's message is answering a different step than the current one.
         
         This handles the case where the AI asks about a step out of order,
         so the user's response needs to be mapped to the correct config field.
         Returns the matching step, or None if the current step is correct.
         """
-        msg_lower = message.lower().strip()
-        
-        # Skip detection for casual messages
-        if self._is_casual_message(message):
-            return None
-        
-        # Intent patterns: keyword → ConfigStep mapping
-        intent_signals = {
-            ConfigStep.PARENT_CHAIN: [
-                "mainnet", "testnet", "sepolia", "arbitrum one",
-                "arbitrum nova", "production", "main net",
-            ],
-            ConfigStep.DATA_AVAILABILITY: [
-                "anytrust", "any trust", "rollup", "roll up", "roll-up",
-                "data availability", "full rollup", "full security",
-                "ethereum da", "dac committee",
-            ],
-            ConfigStep.VALIDATORS: [
-                "validator",
-            ],
-            ConfigStep.OWNER_ADDRESS: [
-                "0x", "my wallet", "connected wallet", "my address",
-            ],
-            ConfigStep.NATIVE_TOKEN: [
-                "custom token", "native token", "gas token",
-            ],
-        }
-        
         # Check if message matches a different step
-        for step, keywords in intent_signals.items():
-            if step == session.current_step:
-                continue  # Skip the current step
-            if any(kw in msg_lower for kw in keywords):
+        current_step = session.current_step
+        msg_chars = set(msg_lower)
+        for kw, kw_chars, step in _INTENT_BY_KW:
+            if step != current_step and kw_chars <= msg_chars and kw in msg_lower:
                 return step
         
         return None
     
-    def _is_casual_message(self, message: str) -> bool:
+    def _is_casual_message(self, msg_lower: str) -> bool:
         """Check if message is casual chat that shouldn't advance config."""
-        msg_lower = message.lower().strip()
-        
-        # Common greetings and casual messages
-        casual_patterns = [
-            "hi", "hello", "hey", "hola", "sup", "yo",
-            "what's up", "whats up", "wassup",
-            "good morning", "good afternoon", "good evening",
-            "how are you", "how's it going", "how are things",
-            "thanks", "thank you", "thx",
-            "ok", "okay", "cool", "nice", "great", "awesome",
-            "hmm", "um", "uh", "err",
-            "help", "what", "huh", "?",
-            "test", "testing", "asdf", "aaa", "bbb",
-        ]
-        
-        # Exact matches or very short non-config messages
-        if msg_lower in casual_patterns or len(msg_lower) <= 2:
+        # Very short non-config messages or exact matches
+        msg_len = len(msg_lower)
+        if msg_len <= 2 or (msg_len <= _CASUAL_MAX_LEN and msg_lower in _CASUAL_MESSAGES):
             return True
         
         # Starts with greeting
-        greeting_starters = ["hi ", "hey ", "hello ", "yo "]
-        if any(msg_lower.startswith(g) for g in greeting_starters):
-            return True
-        
-        return False
+        return msg_lower.startswith(_GREETING_STARTERS)
     
-    def _extract_value(self, session: ConversationSession, message: str) -> Optional[any]:
+    def _extract_value(self, session: ConversationSession, message: str, msg_lower: str) -> Optional[any]:
         """Extract configuration value from user message based on current step."""
         step = session.current_step
-        msg_lower = message.lower().strip()
         
         logger.info(f"_extract_value called: step={step.value}, message='{message}'")
         
-        # Don't advance on casual greetings
-        if self._is_casual_message(message):
-            logger.info(f"Message '{message}' detected as casual, skipping extraction")
-            return None
-        
-        if step == ConfigStep.USE_CASE:
-            use_case = parse_use_case_from_text(message)
-            logger.info(f"USE_CASE extraction: parse_use_case_from_text('{message}') = {use_case}")
-            if use_case:
-                # Also set defaults based on use case
-                preset = get_preset(use_case)
-                session.collected_params["_preset"] = preset
-                # Pre-fill all config fields with preset defaults
-                # so the configuration panel updates immediately
-                defaults = preset.get("defaults", {})
-                default_mapping = {
-                    "data_availability": defaults.get("data_availability"),
-                    "block_time": defaults.get("block_time"),
-                    "gas_limit": defaults.get("gas_limit"),
-                    "validators": defaults.get("validators"),
-                    "challenge_period": defaults.get("challenge_period_days"),
-                    "native_token": {"name": "Ether", "symbol": "ETH", "decimals": 18},
-                    "parent_chain": "arbitrum-sepolia",
-                }
-                for key, value in default_mapping.items():
-                    if value is not None and key not in session.collected_params:
-                        session.collected_params[key] = value
-                # Track which params are defaults vs user-confirmed
-                session.collected_params["_defaults"] = list(default_mapping.keys())
-                return use_case
-            # Only return general if message contains use-case keywords
-            use_case_keywords = ["app", "chain", "project", "build", "create", "making", "platform"]
-            if any(kw in msg_lower for kw in use_case_keywords):
-                return "general"
+        handler = self._extractors.get(step)
+        return handler(session, message, msg_lower) if handler else None
+    
+    def _extract_use_case(self, session: ConversationSession, message: str, msg_lower: str) -> Optional[str]:
+        """Extract the use case and pre-fill its preset defaults."""
+        use_case = parse_use_case_from_text(message)
+        logger.info(f"USE_CASE extraction: parse_use_case_from_text('{message}') = {use_case}")
+        if use_case:
+            # Also set defaults based on use case
+            preset = get_preset(use_case)
+            session.collected_params["_preset"] = preset
+            # Pre-fill all config fields with preset defaults
+            # so the configuration panel updates immediately
+            defaults = preset.get("defaults", {})
+            default_mapping = {
+                "data_availability": defaults.get("data_availability"),
+                "block_time": defaults.get("block_time"),
+                "gas_limit": defaults.get("gas_limit"),
+                "validators": defaults.get("validators"),
+                "challenge_period": defaults.get("challenge_period_days"),
+                "native_token": {"name": "Ether", "symbol": "ETH", "decimals": 18},
+                "parent_chain": "arbitrum-sepolia",
+            }
+            for key, value in default_mapping.items():
+                if value is not None and key not in session.collected_params:
+                    session.collected_params[key] = value
+            # Track which params are defaults vs user-confirmed
+            session.collected_params["_defaults"] = set(default_mapping)
+            return use_case
+        # Only return general if message contains use-case keywords
+        if _has_use_case_keyword(msg_lower):
+            return "general"
+        return None
+    
+    def _extract_chain_name(self, session: ConversationSession, message: str, msg_lower: str) -> Optional[str]:
+        """Extract a chain name, rejecting answers meant for other steps."""
+        # Reject messages that are clearly about other config steps
+        if _has_config_keyword(msg_lower):
             return None
         
-        elif step == ConfigStep.CHAIN_NAME:
-            # Reject messages that are clearly about other config steps
-            config_keywords = [
-                "mainnet", "testnet", "sepolia", "nova", "arbitrum",
-                "rollup", "anytrust", "trust",
-                "validator", "eth", "ether", "custom token",
-                "wallet", "address", "0x",
-                "second", "fast", "slow",
-                "million", "gas",
-                "days", "week", "challenge",
-                "production", "deploy",
-            ]
-            if any(kw in msg_lower for kw in config_keywords):
+        name = extract_chain_name_from_text(message)
+        if name:
+            # Double-check extracted name isn't a config keyword
+            if _has_config_keyword(name.lower()):
                 return None
-            
-            name = extract_chain_name_from_text(message)
-            if name:
-                # Double-check extracted name isn't a config keyword
-                if any(kw in name.lower() for kw in config_keywords):
-                    return None
-                return name
-            
-            # Accept short single-word or multi-word inputs as chain names
-            # Common patterns: "gamify", "my chain", "orbit gaming"
-            skip_words = ["the", "a", "an", "is", "be", "it"]
-            words = msg_lower.split()
-            
-            # Single word like "gamify" - very likely a chain name
-            if len(words) == 1 and len(message) >= 3 and len(message) <= 50:
-                return message.strip()
-            
-            # Multi-word - check first words aren't just filler
-            if len(message) <= 50 and len(message) >= 3:
-                # Filter out common filler words to get actual name
-                name_parts = [w for w in words if w.lower() not in skip_words]
-                if name_parts:
-                    return " ".join(name_parts).title()  # Title case for nicer formatting
-            
-            return None
+            return name
         
-        elif step == ConfigStep.PARENT_CHAIN:
-            if "sepolia" in msg_lower or "test" in msg_lower:
-                return "arbitrum-sepolia"
-            elif "one" in msg_lower or "main" in msg_lower or "production" in msg_lower:
-                return "arbitrum-one"
-            elif "nova" in msg_lower:
-                return "arbitrum-nova"
-            # Default yes means sepolia
-            elif msg_lower in ["yes", "yeah", "ok", "sure", "sounds good", "yep"]:
-                return "arbitrum-sepolia"
-            return "arbitrum-sepolia"
+        # Accept short single-word or multi-word inputs as chain names
+        # Common patterns: "gamify", "my chain", "orbit gaming"
+        words = msg_lower.split()
         
-        elif step == ConfigStep.DATA_AVAILABILITY:
-            logger.info(f"DATA_AVAILABILITY extraction for message: '{msg_lower}'")
-            # Check for rollup FIRST (more specific patterns)
-            # This ensures "roll up", "rollup", "roll-up" are detected before "trust" pattern
-            rollup_patterns = ["rollup", "roll up", "roll-up", "ethereum da", "full rollup", "full security"]
-            if any(pattern in msg_lower for pattern in rollup_patterns):
-                logger.info(f"Detected rollup pattern in '{msg_lower}'")
-                return "rollup"
-            
-            # Check for anytrust patterns
-            anytrust_patterns = ["anytrust", "any trust", "any-trust", "cheaper", "fast", "dac"]
-            if any(pattern in msg_lower for pattern in anytrust_patterns):
-                logger.info(f"Detected anytrust pattern in '{msg_lower}'")
-                return "anytrust"
-            
-            # Default confirmations use preset
-            if msg_lower in ["yes", "yeah", "ok", "sure", "sounds good", "yep", "that's fine", "works for me"]:
-                preset = session.collected_params.get("_preset", {})
-                result = preset.get("defaults", {}).get("data_availability", "anytrust")
-                logger.info(f"Default confirmation, using preset: {result}")
-                return result
-            
-            # Don't default - return None so AI can clarify
-            logger.info(f"No DATA_AVAILABILITY pattern matched for '{msg_lower}'")
-            return None
+        # Single word like "gamify" - very likely a chain name
+        if len(words) == 1 and len(message) >= 3 and len(message) <= 50:
+            return message.strip()
         
-        elif step == ConfigStep.VALIDATORS:
-            count = parse_validator_count_from_text(message)
-            if count:
-                return count
-            # Default confirmation
-            preset = session.collected_params.get("_preset", {})
-            return preset.get("defaults", {}).get("validators", 3)
+        # Multi-word - check first words aren't just filler
+        if len(message) <= 50 and len(message) >= 3:
+            # Filter out common filler words to get actual name
+            name_parts = [w for w in words if w not in _SKIP_WORDS]
+            if name_parts:
+                return " ".join(name_parts).title()  # Title case for nicer formatting
         
-        elif step == ConfigStep.OWNER_ADDRESS:
-            if extract_wallet_intent(message):
-                if session.wallet_address and is_valid_eth_address(session.wallet_address):
-                    return normalize_eth_address(session.wallet_address)
-                return None
-            # Try to extract address from message
-            import re
-            match = re.search(r"0x[a-fA-F0-9]{40}", message)
-            if match:
-                return normalize_eth_address(match.group())
-            return None
-        
-        elif step == ConfigStep.NATIVE_TOKEN:
-            if "custom" in msg_lower:
-                return {"name": "Custom", "symbol": "TOKEN", "decimals": 18}
-            # Default is ETH
-            return {"name": "Ether", "symbol": "ETH", "decimals": 18}
-        
-        elif step == ConfigStep.BLOCK_TIME:
-            time_val = parse_block_time_from_text(message)
-            if time_val:
-                return time_val
-            # Default confirmation
-            preset = session.collected_params.get("_preset", {})
-            return preset.get("defaults", {}).get("block_time", 2)
-        
-        elif step == ConfigStep.GAS_LIMIT:
-            # Extract number
-            import re
-            numbers = re.findall(r"\b(\d{7,9})\b", message)
-            if numbers:
-                return int(numbers[0])
-            if "30" in msg_lower or "standard" in msg_lower:
-                return 30_000_000
-            if "50" in msg_lower or "high" in msg_lower:
-                return 50_000_000
-            # Default confirmation
+        return None
+    
+    def _extract_parent_chain(self, session: ConversationSession, message: str, msg_lower: str) -> str:
+        """Extract the parent chain (defaults to Arbitrum Sepolia)."""
+        if "sepolia" in msg_lower or "test" in msg_lower:
+            return "arbitrum-sepolia"
+        elif "one" in msg_lower or "main" in msg_lower or "production" in msg_lower:
+            return "arbitrum-one"
+        elif "nova" in msg_lower:
+            return "arbitrum-nova"
+        # Anything else, including a plain "yes", means sepolia
+        return "arbitrum-sepolia"
+    
+    def _extract_data_availability(self, session: ConversationSession, message: str, msg_lower: str) -> Optional[str]:
+        """Extract the data availability mode."""
+        logger.info(f"DATA_AVAILABILITY extraction for message: '{msg_lower}'")
+        # Check for rollup FIRST (more specific patterns)
+        # This ensures "roll up", "rollup", "roll-up" are detected before "trust" pattern
+        if _has_rollup_pattern(msg_lower):
+            logger.info(f"Detected rollup pattern in '{msg_lower}'")
+            return "rollup"
+        
+        # Check for anytrust patterns
+        if _has_anytrust_pattern(msg_lower):
+            logger.info(f"Detected anytrust pattern in '{msg_lower}'")
+            return "anytrust"
+        
+        # Default confirmations use preset
+        if msg_lower in _DA_CONFIRMATIONS:
             preset = session.collected_params.get("_preset", {})
-            return preset.get("defaults", {}).get("gas_limit", 30_000_000)
-        
-        elif step == ConfigStep.CHALLENGE_PERIOD:
-            if "14" in msg_lower or "two week" in msg_lower:
-                return 14
-            return 7
+            result = preset.get("defaults", {}).get("data_availability", "anytrust")
+            logger.info(f"Default confirmation, using preset: {result}")
+            return result
         
+        # Don't default - return None so AI can clarify
+        logger.info(f"No DATA_AVAILABILITY pattern matched for '{msg_lower}'")
         return None
     
-    def _cleanup_expired(self):
-        """Remove expired sessions."""
+    def _extract_validators(self, session: ConversationSession, message: str, msg_lower: str) -> int:
+        """Extract the validator count."""
+        count = parse_validator_count_from_text(message)
+        if count:
+            return count
+        # Default confirmation
+        preset = session.collected_params.get("_preset", {})
+        return preset.get("defaults", {}).get("validators", 3)
+    
+    def _extract_owner_address(self, session: ConversationSession, message: str, msg_lower: str) -> Optional[str]:
+        """Extract the owner address from the message or connected wallet."""
+        if extract_wallet_intent(message):
+            if session.wallet_address and is_valid_eth_address(session.wallet_address):
+                return normalize_eth_address(session.wallet_address)
+            return None
+        # Try to extract address from message
+        match = _ETH_ADDR_RE.search(message)
+        if match:
+            return normalize_eth_address(match.group())
+        return None
+    
+    def _extract_native_token(self, session: ConversationSession, message: str, msg_lower: str) -> dict:
+        """Extract the native gas token."""
+        if "custom" in msg_lower:
+            return {"name": "Custom", "symbol": "TOKEN", "decimals": 18}
+        # Default is ETH
+        return {"name": "Ether", "symbol": "ETH", "decimals": 18}
+    
+    def _extract_block_time(self, session: ConversationSession, message: str, msg_lower: str) -> int:
+        """Extract the block time in seconds."""
+        time_val = parse_block_time_from_text(message)
+        if time_val:
+            return time_val
+        # Default confirmation
+        preset = session.collected_params.get("_preset", {})
+        return preset.get("defaults", {}).get("block_time", 2)
+    
+    def _extract_gas_limit(self, session: ConversationSession, message: str, msg_lower: str) -> int:
+        """Extract the block gas limit."""
+        # Extract number
+        match = _GAS_NUM_RE.search(message)
+        if match:
+            return int(match.group(1))
+        if "30" in msg_lower or "standard" in msg_lower:
+            return 30_000_000
+        if "50" in msg_lower or "high" in msg_lower:
+            return 50_000_000
+        # Default confirmation
+        preset = session.collected_params.get("_preset", {})
+        return preset.get("defaults", {}).get("gas_limit", 30_000_000)
+    
+    def _extract_challenge_period(self, session: ConversationSession, message: str, msg_lower: str) -> int:
+        """Extract the challenge period in days."""
+        if "14" in msg_lower or "two week" in msg_lower:
+            return 14
+        return 7
+    
+    async def run_cleanup(self) -> None:
+        """Expire idle sessions every cleanup interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.cleanup_interval_seconds)
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                logger.error(f"Session cleanup error: {e}")
+    
+    def cleanup_expired(self) -> None:
+        """Remove expired sessions.
+        
+        Runs synchronously on the event loop, so it never interleaves with
+        a session-map mutation made by a request.
+        """
         now = time.time()
-        expired = [
-            sid for sid, ts in self.session_timestamps.items()
-            if now - ts > self.ttl_seconds
-        ]
-        for sid in expired:
-            del self.sessions[sid]
-            del self.session_timestamps[sid]
+        expired = 0
+        # Oldest entries are at the front; stop at the first live one
+        while self.sessions:
+            _, touched_at = next(iter(self.sessions.values()))
+            if now - touched_at <= self.ttl_seconds:
+                break
+            self.sessions.popitem(last=False)
+            expired += 1
+        
+        if self.store:
+            expired += self.store.purge(now - self.ttl_seconds)
         
         if expired:
-            logger.info(f"Cleaned up {len(expired)} expired sessions")
-
-
-# Singleton instance
-_conversation_manager: Optional[ConversationManager] = None
+            logger.info(f"Cleaned up {expired} expired sessions")
 
 
+@functools.lru_cache(maxsize=None)
 def get_conversation_manager() -> ConversationManager:
     """Get or create the conversation manager singleton."""
-    global _conversation_manager
-    if _conversation_manager is None:
-        import os
-        ttl = int(os.getenv("SESSION_TTL_SECONDS", "7200"))
-        _conversation_manager = ConversationManager(ttl_seconds=ttl)
-    return _conversation_manager
+    import os
+    ttl = int(os.getenv("SESSION_TTL_SECONDS", "7200"))
+    dedup = float(os.getenv("REPLY_DEDUP_SECONDS", "30"))
+    max_sessions = int(os.getenv("MAX_SESSIONS", "10000"))
+    return ConversationManager(
+        ttl_seconds=ttl,
+        reply_dedup_seconds=dedup,
+        max_sessions=max_sessions,
+        store=create_session_store(),
+    )
@@ -128,16 +128,27 @@ Everything look good? I can:
 }
 
 
+# Which step questions contain placeholders and need formatting
+_STEP_QUESTION_NEEDS_FORMAT = {step: "{" in question for step, question in STEP_QUESTIONS.items()}
+
+
+class _KeepMissing(dict):
+    """Format context that leaves unknown placeholders in place."""
+    
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
 def get_step_question(step: str, context: dict = None) -> str:
     """Get the question for a specific configuration step."""
-    context = context or {}
-    template = STEP_QUESTIONS.get(step, "Let's continue with the next step.")
-    
-    # Format with context if available
-    try:
-        return template.format(**context)
-    except KeyError:
+    template = STEP_QUESTIONS.get(step)
+    if template is None:
+        return "Let's continue with the next step."
+    if not _STEP_QUESTION_NEEDS_FORMAT[step]:
         return template
+    
+    # Fill in whatever the context provides
+    return template.format_map(_KeepMissing(context or {}))
 
 
 def get_system_prompt(phase: str, current_step: str, collected_params: dict) -> str:
@@ -0,0 +1,82 @@
+"""
+Shared session storage behind the in-process session cache.
+
+The conversation manager keeps hot sessions in memory; a store lets
+sessions outlive a restart and be picked up by other workers.
+"""
+import json
+import logging
+import os
+import sqlite3
+from typing import Optional, Protocol
+
+from models.conversation import ConversationSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(Protocol):
+    """Backing store for conversation sessions."""
+    
+    def load(self, session_id: str, newer_than: float = 0.0) -> Optional[ConversationSession]:
+        """Return the stored session if it was updated after `newer_than`."""
+        ...
+    
+    def save(self, session: ConversationSession) -> None:
+        """Persist a session, replacing any previous copy."""
+        ...
+    
+    def purge(self, older_than: float) -> int:
+        """Remove sessions last updated before `older_than`; returns the count."""
+        ...
+
+
+class SQLiteSessionStore:
+    """Session store backed by a local SQLite file, shared by all workers on a host."""
+    
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Calls run on the event loop; in WAL mode NORMAL skips the per-commit
+        # fsync and stays crash-safe, losing at most the last few writes on power loss
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, updated_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        logger.info(f"Using SQLite session store at {path}")
+    
+    def load(self, session_id: str, newer_than: float = 0.0) -> Optional[ConversationSession]:
+        row = self._conn.execute(
+            "SELECT data FROM sessions WHERE session_id = ? AND updated_at > ?",
+            (session_id, newer_than),
+        ).fetchone()
+        if not row:
+            return None
+        try:
+            return ConversationSession.from_dict(json.loads(row[0]))
+        except Exception as e:
+            # Corrupt or written by an incompatible build; drop it rather
+            # than failing every request for this session until it expires
+            logger.warning(f"Dropping unreadable stored session {session_id}: {e}")
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            return None
+    
+    def save(self, session: ConversationSession) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, updated_at, data) VALUES (?, ?, ?)",
+            (session.session_id, session.updated_at, json.dumps(session.to_dict(), separators=(",", ":"))),
+        )
+    
+    def purge(self, older_than: float) -> int:
+        return self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (older_than,)).rowcount
+
+
+def create_session_store() -> Optional[SessionStore]:
+    """Build the store selected by SESSION_BACKEND ("memory" keeps sessions in-process only)."""
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    if backend == "memory":
+        return None
+    if backend == "sqlite":
+        return SQLiteSessionStore(os.getenv("SESSION_DB_PATH", "sessions.db"))
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
@@ -4,13 +4,17 @@ Orbit AI Backend — FastAPI application.
 Multi-turn conversational AI for L3 chain configuration and deployment.
 """
 import os
+import json
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import httpx
 from dotenv import load_dotenv
+from pydantic import BaseModel
 
 from models.messages import (
     ChatRequest,
@@ -23,6 +27,7 @@ from models.messages import (
     PresetResponse,
     HealthResponse,
 )
+from models.conversation import ConversationSession
 from core.conversation import get_conversation_manager
 from core.config_builder import get_config_builder
 from utils.defaults import get_all_presets
@@ -41,11 +46,32 @@ logger = logging.getLogger(__name__)
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3000")
 
 
+def _json_response(model: BaseModel) -> Response:
+    """Serialize an already-validated model straight to JSON bytes.
+    
+    Returning a Response skips FastAPI's second validation and encoding pass
+    over the response model, which dominates on long message histories.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown."""
     logger.info("Starting Orbit AI Backend...")
+    # Shared client so backend calls reuse pooled keep-alive connections
+    app.state.http_client = httpx.AsyncClient(
+        base_url=BACKEND_URL,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+    # Session expiry runs off the request path
+    cleanup_task = asyncio.create_task(get_conversation_manager().run_cleanup())
     yield
+    cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+    await app.state.http_client.aclose()
     logger.info("Shutting down Orbit AI Backend...")
 
 
@@ -91,37 +117,72 @@ async def chat(request: ChatRequest):
             session_id=request.session_id,
             user_message=request.message,
             wallet_address=request.wallet_address,
+            request_id=request.request_id,
         )
         
-        # Get the latest AI response
-        last_message = session.messages[-1] if session.messages else None
-        ai_response = last_message.content if last_message and last_message.role == "assistant" else ""
-        
-        # Build config if in review phase
-        config_dict = None
-        if session.phase.value in ["review", "deployed"]:
-            builder = get_config_builder()
-            config = builder.build_from_session(session)
-            if config:
-                config_dict = config.to_backend_format()
-                session.config = config_dict
-        
-        return ChatResponse(
-            session_id=session.session_id,
-            message=ai_response,
-            phase=session.phase.value,
-            current_step=session.current_step.value,
-            config_progress=session.get_progress(),
-            collected_params=session.collected_params,
-            config=config_dict,
-            quick_actions=last_message.quick_actions if last_message else None,
-        )
+        return _chat_response(session)
     
     except Exception as e:
         logger.error(f"Chat error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/orbit-ai/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Streaming variant of /chat as server-sent events.
+    
+    Emits a `token` event per chunk of the AI reply as it is generated,
+    then a `done` event carrying the same body /chat would return.
+    """
+    manager = get_conversation_manager()
+    
+    async def events():
+        try:
+            async for chunk in manager.process_message_stream(
+                session_id=request.session_id,
+                user_message=request.message,
+                wallet_address=request.wallet_address,
+                request_id=request.request_id,
+            ):
+                yield f"event: token\ndata: {json.dumps(chunk)}\n\n"
+            
+            session = manager.get_session(request.session_id)
+            yield f"event: done\ndata: {_chat_response(session).model_dump_json()}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}", exc_info=True)
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _chat_response(session: ConversationSession) -> ChatResponse:
+    """Build the chat reply body from a session after its latest turn."""
+    # Get the latest AI response
+    last_message = session.messages[-1] if session.messages else None
+    ai_response = last_message.content if last_message and last_message.role == "assistant" else ""
+    
+    # Build config if in review phase
+    config_dict = None
+    if session.phase.value in ["review", "deployed"]:
+        config_dict = get_config_builder().build_backend_config(session)
+        if config_dict and config_dict != session.config:
+            session.config = config_dict
+            # The turn was saved before the config was built; save again so
+            # /deploy on another worker sends the config the user reviewed
+            get_conversation_manager().save_session(session)
+    
+    return ChatResponse(
+        session_id=session.session_id,
+        message=ai_response,
+        phase=session.phase.value,
+        current_step=session.current_step.value,
+        config_progress=session.get_progress(),
+        collected_params=session.collected_params,
+        config=config_dict,
+        quick_actions=last_message.quick_actions if last_message else None,
+    )
+
+
 @app.get("/api/orbit-ai/session/{session_id}", response_model=SessionResponse)
 async def get_session(session_id: str):
     """Retrieve conversation history and current state."""
@@ -131,7 +192,7 @@ async def get_session(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return SessionResponse(
+    return _json_response(SessionResponse(
         session_id=session.session_id,
         phase=session.phase.value,
         current_step=session.current_step.value,
@@ -139,51 +200,55 @@ async def get_session(session_id: str):
         config=session.config,
         collected_params=session.collected_params,
         messages=[
-            {"id": m.id, "role": m.role, "content": m.content, "timestamp": m.timestamp.isoformat()}
+            {"id": m.id, "role": m.role, "content": m.content, "timestamp": m.timestamp_iso}
             for m in session.messages
         ],
-    )
+    ))
 
 
 @app.post("/api/orbit-ai/session/{session_id}/reset", response_model=SessionResponse)
 async def reset_session(session_id: str):
     """Reset a conversation to start over."""
     manager = get_conversation_manager()
-    session = manager.reset_session(session_id)
+    session = await manager.reset_session(session_id)
     
-    return SessionResponse(
+    return _json_response(SessionResponse(
         session_id=session.session_id,
         phase=session.phase.value,
         current_step=session.current_step.value,
         config_progress=session.get_progress(),
         config=None,
         messages=[
-            {"id": m.id, "role": m.role, "content": m.content, "timestamp": m.timestamp.isoformat()}
+            {"id": m.id, "role": m.role, "content": m.content, "timestamp": m.timestamp_iso}
             for m in session.messages
         ],
-    )
+    ))
 
 
 # ============================================================================
 # Presets Endpoint
 # ============================================================================
 
+# Presets are static, so the response is validated and rendered once
+_PRESETS_RESPONSE = PresetsListResponse(
+    presets=[
+        PresetResponse(
+            id=p["id"],
+            name=p["name"],
+            description=p["description"],
+            icon=p["icon"],
+            defaults=p["defaults"],
+        )
+        for p in get_all_presets()
+    ]
+)
+_PRESETS_JSON = _PRESETS_RESPONSE.model_dump_json()
+
+
 @app.get("/api/orbit-ai/presets", response_model=PresetsListResponse)
 async def get_presets():
     """Returns use-case presets with recommended defaults."""
-    presets = get_all_presets()
-    return PresetsListResponse(
-        presets=[
-            PresetResponse(
-                id=p["id"],
-                name=p["name"],
-                description=p["description"],
-                icon=p["icon"],
-                defaults=p["defaults"],
-            )
-            for p in presets
-        ]
-    )
+    return Response(content=_PRESETS_JSON, media_type="application/json")
 
 
 # ============================================================================
@@ -201,55 +266,53 @@ async def deploy(request: DeployRequest):
     
     if not session.config:
         # Try to build config
-        builder = get_config_builder()
-        config = builder.build_from_session(session)
-        if not config:
+        config_dict = get_config_builder().build_backend_config(session)
+        if not config_dict:
             raise HTTPException(status_code=400, detail="Configuration not complete")
-        session.config = config.to_backend_format()
+        session.config = config_dict
     
+    client = app.state.http_client
     try:
-        async with httpx.AsyncClient() as client:
-            # First, save the config to the backend
-            save_response = await client.post(
-                f"{BACKEND_URL}/api/orbit/config",
-                json=session.config,
-                timeout=30.0,
-            )
-            
-            if save_response.status_code != 201:
-                raise HTTPException(
-                    status_code=save_response.status_code,
-                    detail=f"Failed to save config: {save_response.text}",
-                )
-            
-            save_data = save_response.json()
-            config_id = save_data.get("configId")
-            
-            # Then trigger deployment
-            deploy_response = await client.post(
-                f"{BACKEND_URL}/api/orbit/deploy",
-                json={"configId": config_id},
-                timeout=30.0,
+        # First, save the config to the backend
+        save_response = await client.post(
+            "/api/orbit/config",
+            json=session.config,
+        )
+        
+        if save_response.status_code != 201:
+            raise HTTPException(
+                status_code=save_response.status_code,
+                detail=f"Failed to save config: {save_response.text}",
             )
-            
-            if deploy_response.status_code != 200:
-                raise HTTPException(
-                    status_code=deploy_response.status_code,
-                    detail=f"Failed to deploy: {deploy_response.text}",
-                )
-            
-            deploy_data = deploy_response.json()
-            deployment_id = deploy_data.get("deploymentId")
-            
-            # Update session
-            session.deployment_id = deployment_id
-            session.deployment_status = "started"
-            
-            return DeployResponse(
-                deployment_id=deployment_id,
-                status="started",
-                message=f"Deployment initiated for {session.config.get('chainConfig', {}).get('chainName', 'your chain')}",
+        
+        save_data = save_response.json()
+        config_id = save_data.get("configId")
+        
+        # Then trigger deployment
+        deploy_response = await client.post(
+            "/api/orbit/deploy",
+            json={"configId": config_id},
+        )
+        
+        if deploy_response.status_code != 200:
+            raise HTTPException(
+                status_code=deploy_response.status_code,
+                detail=f"Failed to deploy: {deploy_response.text}",
             )
+        
+        deploy_data = deploy_response.json()
+        deployment_id = deploy_data.get("deploymentId")
+        
+        # Update session
+        session.deployment_id = deployment_id
+        session.deployment_status = "started"
+        manager.save_session(session)
+        
+        return DeployResponse(
+            deployment_id=deployment_id,
+            status="started",
+            message=f"Deployment initiated for {session.config.get('chainConfig', {}).get('chainName', 'your chain')}",
+        )
     
     except httpx.HTTPError as e:
         logger.error(f"Backend connection error: {e}")
@@ -259,32 +322,31 @@ async def deploy(request: DeployRequest):
 @app.get("/api/orbit-ai/deploy/status/{deployment_id}", response_model=DeployStatusResponse)
 async def get_deployment_status(deployment_id: str):
     """Poll deployment progress (proxy to Node.js backend)."""
+    client = app.state.http_client
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{BACKEND_URL}/api/orbit/deploy/status/{deployment_id}",
-                timeout=30.0,
-            )
-            
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Deployment not found")
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to get status: {response.text}",
-                )
-            
-            data = response.json()
-            
-            return DeployStatusResponse(
-                deployment_id=deployment_id,
-                status=data.get("status", "unknown"),
-                progress=data.get("progress", 0),
-                current_step=data.get("currentStep"),
-                error=data.get("error"),
-                result=data.get("result"),
+        response = await client.get(
+            f"/api/orbit/deploy/status/{deployment_id}",
+        )
+        
+        if response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Deployment not found")
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get status: {response.text}",
             )
+        
+        data = response.json()
+        
+        return DeployStatusResponse(
+            deployment_id=deployment_id,
+            status=data.get("status", "unknown"),
+            progress=data.get("progress", 0),
+            current_step=data.get("currentStep"),
+            error=data.get("error"),
+            result=data.get("result"),
+        )
     
     except httpx.HTTPError as e:
         logger.error(f"Backend connection error: {e}")
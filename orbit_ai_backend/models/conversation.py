@@ -1,10 +1,14 @@
 """
 Pydantic models for conversation state and session management.
 """
-from datetime import datetime
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, Field
+from functools import cached_property
+from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ConversationPhase(str, Enum):
@@ -33,7 +37,7 @@ class ConfigStep(str, Enum):
 
 
 # Order of steps for iteration
-CONFIG_STEP_ORDER = [
+CONFIG_STEP_ORDER = (
     ConfigStep.USE_CASE,
     ConfigStep.CHAIN_NAME,
     ConfigStep.PARENT_CHAIN,
@@ -45,27 +49,56 @@ CONFIG_STEP_ORDER = [
     ConfigStep.GAS_LIMIT,
     ConfigStep.CHALLENGE_PERIOD,
     ConfigStep.COMPLETE,
-]
+)
+
+# Position of each step in CONFIG_STEP_ORDER
+_STEP_INDEX = {step: i for i, step in enumerate(CONFIG_STEP_ORDER)}
+
+# Neighbouring steps for advance_step/go_back_step
+_NEXT_STEP = dict(zip(CONFIG_STEP_ORDER, CONFIG_STEP_ORDER[1:]))
+_PREV_STEP = dict(zip(CONFIG_STEP_ORDER[1:], CONFIG_STEP_ORDER))
+
+# Values of the steps that count towards progress (all but COMPLETE)
+_STEP_VALUES = [step.value for step in CONFIG_STEP_ORDER if step != ConfigStep.COMPLETE]
+
+# Number of recent messages sent to the LLM as conversation history
+HISTORY_WINDOW = 10
+
+# Number of messages retained per session (older ones are dropped)
+MAX_STORED_MESSAGES = 64
 
 
 class Message(BaseModel):
     """A single message in the conversation."""
+    model_config = ConfigDict(frozen=True)
     id: str
     role: str  # "user" | "assistant"
     content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: float = Field(default_factory=time.time)  # epoch seconds
     quick_actions: Optional[list[dict]] = None  # [{label, value}] for inline buttons
+    
+    @cached_property
+    def timestamp_iso(self) -> str:
+        """ISO-8601 UTC timestamp with offset, rendered once per message."""
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
 
 
 class ConfigProgress(BaseModel):
     """Progress through configuration steps."""
+    model_config = ConfigDict(frozen=True)
     completed: list[str] = Field(default_factory=list)
     remaining: list[str] = Field(default_factory=list)
     percentage: int = 0
 
 
-class ConversationSession(BaseModel):
-    """Full conversation session state."""
+@dataclass(slots=True)
+class ConversationSession:
+    """Full conversation session state.
+    
+    Sessions are internal state that is never parsed from or dumped to the
+    API, so a slotted dataclass is used instead of a pydantic model to keep
+    attribute writes and per-session memory cheap.
+    """
     session_id: str
     user_id: Optional[str] = None
     wallet_address: Optional[str] = None
@@ -74,11 +107,11 @@ class ConversationSession(BaseModel):
     phase: ConversationPhase = ConversationPhase.GREETING
     current_step: ConfigStep = ConfigStep.USE_CASE
     
-    # History
-    messages: list[Message] = Field(default_factory=list)
+    # History (bounded ring of the most recent messages)
+    messages: deque[Message] = field(default_factory=lambda: deque(maxlen=MAX_STORED_MESSAGES))
     
     # Collected parameters (values collected from conversation)
-    collected_params: dict = Field(default_factory=dict)
+    collected_params: dict = field(default_factory=dict)
     
     # Final config (built from collected_params)
     config: Optional[dict] = None
@@ -87,54 +120,122 @@ class ConversationSession(BaseModel):
     deployment_id: Optional[str] = None
     deployment_status: Optional[str] = None
     
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Timestamps (epoch seconds)
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    
+    # Last OrbitConfig built from collected_params (see ConfigBuilder)
+    _config_cache_key: Optional[int] = field(default=None, init=False, repr=False)
+    _config_cache: Any = field(default=None, init=False, repr=False)
+    _backend_config_cache: Optional[dict] = field(default=None, init=False, repr=False)
+    
+    # Last HISTORY_WINDOW messages as LLM-ready {role, content} dicts
+    _recent_history: deque = field(
+        default_factory=lambda: deque(maxlen=HISTORY_WINDOW), init=False, repr=False
+    )
+    
+    # Sequence number of the last message ID handed out
+    _msg_counter: int = field(default=0, init=False, repr=False)
+    
+    # (step, progress) from the last get_progress call
+    _progress_cache: Optional[tuple[ConfigStep, ConfigProgress]] = field(default=None, init=False, repr=False)
+    
+    def to_dict(self) -> dict:
+        """JSON-safe snapshot of the session; derived caches are rebuilt on demand."""
+        params = dict(self.collected_params)
+        if "_defaults" in params:
+            params["_defaults"] = sorted(params["_defaults"])
+        return {
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "wallet_address": self.wallet_address,
+            "phase": self.phase.value,
+            "current_step": self.current_step.value,
+            "messages": [m.model_dump() for m in self.messages],
+            "collected_params": params,
+            "config": self.config,
+            "deployment_id": self.deployment_id,
+            "deployment_status": self.deployment_status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "msg_counter": self._msg_counter,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversationSession":
+        """Rebuild a session from a to_dict snapshot."""
+        params = dict(data["collected_params"])
+        if "_defaults" in params:
+            params["_defaults"] = set(params["_defaults"])
+        session = cls(
+            session_id=data["session_id"],
+            user_id=data["user_id"],
+            wallet_address=data["wallet_address"],
+            phase=ConversationPhase(data["phase"]),
+            current_step=ConfigStep(data["current_step"]),
+            collected_params=params,
+            config=data["config"],
+            deployment_id=data["deployment_id"],
+            deployment_status=data["deployment_status"],
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+        )
+        # Replaying the messages also refills the LLM history window
+        for message in data["messages"]:
+            session.add_message(Message(**message))
+        session._msg_counter = data["msg_counter"]
+        return session
+    
+    def next_message_id(self) -> str:
+        """Return a new message ID, unique within this session."""
+        self._msg_counter += 1
+        return f"{self.session_id[:8]}-{self._msg_counter}"
+    
+    def add_message(self, message: Message) -> None:
+        """Append a message to the history."""
+        self.messages.append(message)
+        self._recent_history.append({"role": message.role, "content": message.content})
+    
+    def get_recent_history(self) -> list[dict]:
+        """Get the last HISTORY_WINDOW messages for the LLM."""
+        return list(self._recent_history)
     
     def get_progress(self) -> ConfigProgress:
         """Calculate configuration progress."""
-        completed = []
-        remaining = []
-        
-        current_idx = CONFIG_STEP_ORDER.index(self.current_step)
+        # Progress depends only on the current step
+        cached = self._progress_cache
+        if cached and cached[0] == self.current_step:
+            return cached[1]
         
-        for i, step in enumerate(CONFIG_STEP_ORDER):
-            if step == ConfigStep.COMPLETE:
-                continue
-            if i < current_idx:
-                completed.append(step.value)
-            else:
-                remaining.append(step.value)
+        current_idx = _STEP_INDEX[self.current_step]
+        completed = _STEP_VALUES[:current_idx]
+        remaining = _STEP_VALUES[current_idx:]
         
-        total = len(CONFIG_STEP_ORDER) - 1  # Exclude COMPLETE
+        total = len(_STEP_VALUES)
         pct = int((len(completed) / total) * 100) if total > 0 else 0
         
-        return ConfigProgress(
+        progress = ConfigProgress(
             completed=completed,
             remaining=remaining,
             percentage=pct
         )
+        self._progress_cache = (self.current_step, progress)
+        return progress
     
     def advance_step(self) -> bool:
         """Advance to the next configuration step. Returns True if advanced."""
-        try:
-            current_idx = CONFIG_STEP_ORDER.index(self.current_step)
-            if current_idx < len(CONFIG_STEP_ORDER) - 1:
-                self.current_step = CONFIG_STEP_ORDER[current_idx + 1]
-                self.updated_at = datetime.utcnow()
-                return True
-        except ValueError:
-            pass
-        return False
+        next_step = _NEXT_STEP.get(self.current_step)
+        if next_step is None:
+            return False
+        self.current_step = next_step
+        self.updated_at = time.time()
+        return True
     
     def go_back_step(self) -> bool:
         """Go back to the previous step. Returns True if went back."""
-        try:
-            current_idx = CONFIG_STEP_ORDER.index(self.current_step)
-            if current_idx > 0:
-                self.current_step = CONFIG_STEP_ORDER[current_idx - 1]
-                self.updated_at = datetime.utcnow()
-                return True
-        except ValueError:
-            pass
-        return False
+        prev_step = _PREV_STEP.get(self.current_step)
+        if prev_step is None:
+            return False
+        self.current_step = prev_step
+        self.updated_at = time.time()
+        return True
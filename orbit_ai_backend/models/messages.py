@@ -2,21 +2,26 @@
 API request/response message schemas.
 """
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .conversation import ConfigProgress
 
 
 class ChatRequest(BaseModel):
     """Request body for /api/orbit-ai/chat endpoint."""
+    model_config = ConfigDict(frozen=True)
     session_id: str = Field(..., description="Conversation session ID (UUID)")
     message: str = Field(..., min_length=1, description="User message")
     wallet_address: Optional[str] = Field(None, description="Connected wallet address")
     user_id: Optional[str] = Field(None, description="Privy user ID")
+    request_id: Optional[str] = Field(
+        None, description="Client idempotency key; retries with the same key get the original reply"
+    )
 
 
 class ChatResponse(BaseModel):
     """Response from /api/orbit-ai/chat endpoint."""
+    model_config = ConfigDict(frozen=True)
     session_id: str
     message: str
     phase: str  # greeting, discovery, configuration, review, deploying, deployed
@@ -30,6 +35,7 @@ class ChatResponse(BaseModel):
 
 class SessionResponse(BaseModel):
     """Response from /api/orbit-ai/session/{id} endpoint."""
+    model_config = ConfigDict(frozen=True)
     session_id: str
     phase: str
     current_step: Optional[str] = None
@@ -41,12 +47,14 @@ class SessionResponse(BaseModel):
 
 class DeployRequest(BaseModel):
     """Request body for /api/orbit-ai/deploy endpoint."""
+    model_config = ConfigDict(frozen=True)
     session_id: str
     config_id: Optional[str] = None  # Config ID if already saved
 
 
 class DeployResponse(BaseModel):
     """Response from /api/orbit-ai/deploy endpoint."""
+    model_config = ConfigDict(frozen=True)
     deployment_id: str
     status: str  # started, in_progress, completed, failed
     message: str
@@ -54,6 +62,7 @@ class DeployResponse(BaseModel):
 
 class DeployStatusResponse(BaseModel):
     """Response from /api/orbit-ai/deploy/status/{id} endpoint."""
+    model_config = ConfigDict(frozen=True)
     deployment_id: str
     status: str
     progress: int = 0
@@ -64,6 +73,7 @@ class DeployStatusResponse(BaseModel):
 
 class PresetResponse(BaseModel):
     """A use-case preset configuration."""
+    model_config = ConfigDict(frozen=True)
     id: str
     name: str
     description: str
@@ -73,11 +83,13 @@ class PresetResponse(BaseModel):
 
 class PresetsListResponse(BaseModel):
     """Response from /api/orbit-ai/presets endpoint."""
+    model_config = ConfigDict(frozen=True)
     presets: list[PresetResponse]
 
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = ConfigDict(frozen=True)
     status: str = "healthy"
     version: str = "1.0.0"
     service: str = "orbit-ai-backend"
@@ -1,23 +1,22 @@
 """
 Pydantic models for Orbit L3 chain configuration.
 """
-from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import Literal, Optional, get_args
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 import re
 
+from utils.validators import is_valid_eth_address
 
-class DataAvailabilityMode(str, Enum):
-    """Data availability modes for Orbit chains."""
-    ANYTRUST = "anytrust"
-    ROLLUP = "rollup"
+_NAME_CLEAN_RE = re.compile(r"[^a-zA-Z0-9\s-]")
+_NAME_SPACE_RE = re.compile(r"\s+")
 
 
-class ParentChain(str, Enum):
-    """Supported parent chains."""
-    ARBITRUM_SEPOLIA = "arbitrum-sepolia"
-    ARBITRUM_ONE = "arbitrum-one"
-    ARBITRUM_NOVA = "arbitrum-nova"
+# Plain string literals validate with a hash lookup instead of Enum coercion
+DataAvailabilityMode = Literal["anytrust", "rollup"]
+ParentChain = Literal["arbitrum-sepolia", "arbitrum-one", "arbitrum-nova"]
+
+DATA_AVAILABILITY_MODES = frozenset(get_args(DataAvailabilityMode))
+PARENT_CHAINS = frozenset(get_args(ParentChain))
 
 
 class NativeToken(BaseModel):
@@ -42,14 +41,14 @@ class OrbitConfig(BaseModel):
     # Required
     name: str = Field(..., description="URL-friendly chain name")
     chain_id: int = Field(..., ge=412000, le=999999, description="Unique chain ID")
-    parent_chain: ParentChain = ParentChain.ARBITRUM_SEPOLIA
+    parent_chain: ParentChain = "arbitrum-sepolia"
     owner_address: str = Field(..., description="Chain owner wallet address")
     
     # Validators
     validators: list[str] = Field(default_factory=list, min_length=1)
     
     # Data availability
-    data_availability: DataAvailabilityMode = DataAvailabilityMode.ANYTRUST
+    data_availability: DataAvailabilityMode = "anytrust"
     
     # Chain config
     chain_config: ChainConfig
@@ -66,26 +65,24 @@ class OrbitConfig(BaseModel):
     def validate_address(cls, v: Optional[str]) -> Optional[str]:
         if v is None:
             return v
-        if not re.match(r"^0x[a-fA-F0-9]{40}$", v):
+        if not is_valid_eth_address(v):
             raise ValueError("Invalid Ethereum address format")
         return v.lower()
     
     @field_validator("validators")
     @classmethod
     def validate_validators(cls, v: list[str]) -> list[str]:
-        validated = []
-        for addr in v:
-            if not re.match(r"^0x[a-fA-F0-9]{40}$", addr):
-                raise ValueError(f"Invalid validator address: {addr}")
-            validated.append(addr.lower())
-        return validated
+        bad = next((addr for addr in v if not is_valid_eth_address(addr)), None)
+        if bad is not None:
+            raise ValueError(f"Invalid validator address: {bad}")
+        return [addr.lower() for addr in v]
     
     @field_validator("name")
     @classmethod
     def validate_name(cls, v: str) -> str:
         # Make URL-friendly: lowercase, replace spaces with hyphens
-        clean = re.sub(r"[^a-zA-Z0-9\s-]", "", v)
-        clean = re.sub(r"\s+", "-", clean).lower().strip("-")
+        clean = _NAME_CLEAN_RE.sub("", v)
+        clean = _NAME_SPACE_RE.sub("-", clean).lower().strip("-")
         if not clean:
             raise ValueError("Chain name must contain alphanumeric characters")
         return clean
@@ -94,35 +91,39 @@ class OrbitConfig(BaseModel):
         """Convert to format expected by Node.js backend."""
         # Use owner_address as sequencer if not set separately
         sequencer = self.sequencer_address or self.owner_address
+        chain_config = self.chain_config
+        native_token = chain_config.native_token
         
         return {
-            "name": self.chain_config.chain_name,
+            "name": chain_config.chain_name,
             "chainId": self.chain_id,
-            "parentChain": self.parent_chain.value,
+            "parentChain": self.parent_chain,
             "description": f"L3 chain for {self.use_case or 'general'} use case",
             # Required by backend deploy endpoint
             "ownerAddress": self.owner_address,
             "sequencerAddress": sequencer,
             "batchPosterAddress": self.batch_poster_address or sequencer,
             "validators": self.validators,
-            "dataAvailability": self.data_availability.value,
-            "challengePeriod": self.chain_config.challenge_period_days * 86400,  # days to seconds
+            "dataAvailability": self.data_availability,
+            "challengePeriod": chain_config.challenge_period_days * 86400,  # days to seconds
             # Gas config
             "l2GasPrice": "0.1",
             "l1GasPrice": "10",
             # Chain config details
             "nativeToken": {
-                "name": self.chain_config.native_token.name,
-                "symbol": self.chain_config.native_token.symbol,
-                "decimals": self.chain_config.native_token.decimals,
+                "name": native_token.name,
+                "symbol": native_token.symbol,
+                "decimals": native_token.decimals,
             },
-            "blockTime": self.chain_config.block_time,
-            "gasLimit": self.chain_config.gas_limit,
+            "blockTime": chain_config.block_time,
+            "gasLimit": chain_config.gas_limit,
         }
 
 
 class PartialOrbitConfig(BaseModel):
     """Partial config during collection (all fields optional)."""
+    # Not used on the request path; build the schema only if it ever is
+    model_config = ConfigDict(defer_build=True)
     name: Optional[str] = None
     chain_id: Optional[int] = None
     parent_chain: Optional[str] = None
@@ -1,6 +1,8 @@
 """
 Smart defaults and use-case presets for Orbit configuration.
 """
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 
@@ -74,48 +76,71 @@ USE_CASE_PRESETS = {
 }
 
 
+# Read-only view so shared preset state can't be mutated by callers
+USE_CASE_PRESETS = MappingProxyType(USE_CASE_PRESETS)
+
+# Presets never change, so the list view is built once
+_ALL_PRESETS = tuple(USE_CASE_PRESETS.values())
+
+
+@lru_cache(maxsize=16)
 def get_preset(use_case: str) -> dict:
     """Get preset configuration for a use case."""
     return USE_CASE_PRESETS.get(use_case.lower(), USE_CASE_PRESETS["general"])
 
 
-def get_all_presets() -> list[dict]:
+def get_all_presets() -> tuple[dict, ...]:
     """Get all available presets."""
-    return list(USE_CASE_PRESETS.values())
+    return _ALL_PRESETS
 
 
+@lru_cache(maxsize=64)
 def get_default_value(use_case: str, field: str) -> Any:
     """Get a specific default value for a use case."""
     preset = get_preset(use_case)
     return preset["defaults"].get(field)
 
 
+def _placeholder_validator(n: int) -> str:
+    """Placeholder address repeating n's hex digits: 0x1111...1111, 0x1010...1010."""
+    return "0x" + (f"{n:x}" * 40)[:40]
+
+
+# Enough placeholders for the maximum validator count, built once
+_PLACEHOLDER_VALIDATORS = [_placeholder_validator(n) for n in range(1, 21)]
+
+
 def generate_validators(count: int) -> list[str]:
     """Generate placeholder validator addresses."""
-    validators = []
-    for i in range(count):
-        # Generate address like 0x1111...1111, 0x2222...2222, etc.
-        hex_char = hex(i + 1)[2:]
-        addr = "0x" + hex_char * 40
-        validators.append(addr[:42])  # Ensure exactly 42 chars
-    return validators
+    if count <= len(_PLACEHOLDER_VALIDATORS):
+        return _PLACEHOLDER_VALIDATORS[:max(count, 0)]
+    return [_placeholder_validator(n) for n in range(1, count + 1)]
+
+
+# Spaces and underscores both become hyphens in URL slugs
+_SLUG_TABLE = str.maketrans({" ": "-", "_": "-"})
+
+
+def _slugify(chain_name: str) -> str:
+    """Lowercase a chain name and hyphenate it for use in URLs."""
+    return chain_name.lower().translate(_SLUG_TABLE)
 
 
 def generate_sequencer_url(chain_name: str) -> str:
     """Generate a sequencer URL for a chain."""
-    clean_name = chain_name.lower().replace(" ", "-").replace("_", "-")
+    clean_name = _slugify(chain_name)
     return f"https://sequencer-{clean_name}.example.com"
 
 
 def generate_explorer_url(chain_name: str) -> str:
     """Generate an explorer URL for a chain."""
-    clean_name = chain_name.lower().replace(" ", "-").replace("_", "-")
+    clean_name = _slugify(chain_name)
     return f"https://{clean_name}-explorer.example.com"
 
 
 def generate_rpc_url(chain_name: str) -> str:
     """Generate an RPC URL for a chain."""
-    clean_name = chain_name.lower().replace(" ", "-").replace("_", "-")
+    clean_name = _slugify(chain_name)
     return f"https://{clean_name}-rpc.example.com"
 
 
@@ -147,6 +172,7 @@ PARENT_CHAINS = {
 }
 
 
+@lru_cache(maxsize=8)
 def get_parent_chain_info(parent_chain: str) -> dict:
     """Get info about a parent chain."""
     return PARENT_CHAINS.get(parent_chain, PARENT_CHAINS["arbitrum-sepolia"])
@@ -1,15 +1,49 @@
 """
 Input validators for Ethereum addresses, chain IDs, etc.
 """
+import random
 import re
 from typing import Optional
 
+# Deletes every hex digit, so a hex-only string translates to ""
+_HEX_TABLE = str.maketrans("", "", "0123456789abcdefABCDEF")
+
+# Bound once so chain ID generation skips the module and randint indirection
+_randrange = random.Random().randrange
+
+_NUM_RE = re.compile(r"\b(\d+)\b")
+
+# Checked in order as substrings, so "one" wins over "ten" when both appear
+_WORD_NUMBERS = (
+    ("one", 1), ("two", 2), ("three", 3), ("four", 4), ("five", 5),
+    ("six", 6), ("seven", 7), ("eight", 8), ("nine", 9), ("ten", 10),
+)
+
+# Block time patterns like "1s", "1 second", "1 sec"
+_BLOCK_TIME_PATTERNS = (
+    re.compile(r"(\d+)\s*s(?:ec(?:ond)?s?)?"),
+    re.compile(r"(\d+)\s*second"),
+)
+
+# Chain name patterns: "called X", "named X", "name is X", "name: X"
+_CHAIN_NAME_PHRASE_RE = re.compile(
+    r"(?:called|named|name\s+is|name:)\s+[\"']?([a-zA-Z0-9\s]+)[\"']?", re.IGNORECASE
+)
+# Patterns anchored on a leading letter
+_CHAIN_NAME_START_PATTERNS = (
+    re.compile(r"^([A-Z][a-zA-Z0-9]+(?:\s+[A-Z][a-zA-Z0-9]+)*)", re.IGNORECASE),  # Title case words at start
+    re.compile(r"^([a-zA-Z][a-zA-Z0-9]+)$", re.IGNORECASE),  # Single word name (any case)
+)
+
 
 def is_valid_eth_address(address: str) -> bool:
     """Validate Ethereum address format."""
-    if not address:
-        return False
-    return bool(re.match(r"^0x[a-fA-F0-9]{40}$", address))
+    return (
+        bool(address)
+        and len(address) == 42
+        and address[:2] == "0x"
+        and not address[2:].translate(_HEX_TABLE)
+    )
 
 
 def normalize_eth_address(address: str) -> str:
@@ -35,8 +69,7 @@ def is_valid_chain_id(chain_id: int) -> bool:
 
 def generate_chain_id() -> int:
     """Generate a random unique chain ID for L3."""
-    import random
-    return random.randint(412000, 499999)
+    return _randrange(412000, 500000)
 
 
 def validate_validators_count(count: int) -> bool:
@@ -48,19 +81,15 @@ def parse_validator_count_from_text(text: str) -> Optional[int]:
     """Extract validator count from natural language."""
     text = text.lower()
     
-    # Direct numbers
-    numbers = re.findall(r"\b(\d+)\b", text)
-    if numbers:
-        count = int(numbers[0])
+    # Direct numbers (only the first one counts)
+    match = _NUM_RE.search(text)
+    if match:
+        count = int(match.group(1))
         if validate_validators_count(count):
             return count
     
     # Word numbers
-    word_to_num = {
-        "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-        "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
-    }
-    for word, num in word_to_num.items():
+    for word, num in _WORD_NUMBERS:
         if word in text:
             return num
     
@@ -71,14 +100,8 @@ def parse_block_time_from_text(text: str) -> Optional[int]:
     """Extract block time from natural language (in seconds)."""
     text = text.lower()
     
-    # Look for patterns like "1s", "1 second", "1 sec"
-    patterns = [
-        r"(\d+)\s*s(?:ec(?:ond)?s?)?",
-        r"(\d+)\s*second",
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _BLOCK_TIME_PATTERNS:
+        match = pattern.search(text)
         if match:
             time = int(match.group(1))
             if 1 <= time <= 30:
@@ -93,19 +116,21 @@ def parse_block_time_from_text(text: str) -> Optional[int]:
     return None
 
 
+# Use cases in priority order; the first one with a matching keyword wins
+_USE_CASE_KEYWORDS = (
+    ("gaming", ("gaming", "game", "player", "esports", "nft game", "play to earn", "p2e")),
+    ("defi", ("defi", "finance", "trading", "exchange", "lending", "yield", "swap", "dex")),
+    ("enterprise", ("enterprise", "private", "business", "corporate", "internal")),
+    ("nft", ("nft", "collectible", "art", "marketplace", "token")),
+    ("general", ("general", "basic", "simple")),
+)
+
+
 def parse_use_case_from_text(text: str) -> Optional[str]:
     """Detect use case from natural language description."""
     text = text.lower()
     
-    use_cases = {
-        "gaming": ["gaming", "game", "player", "esports", "nft game", "play to earn", "p2e"],
-        "defi": ["defi", "finance", "trading", "exchange", "lending", "yield", "swap", "dex"],
-        "enterprise": ["enterprise", "private", "business", "corporate", "internal"],
-        "nft": ["nft", "collectible", "art", "marketplace", "token"],
-        "general": ["general", "basic", "simple"],
-    }
-    
-    for use_case, keywords in use_cases.items():
+    for use_case, keywords in _USE_CASE_KEYWORDS:
         for keyword in keywords:
             if keyword in text:
                 return use_case
@@ -115,28 +140,42 @@ def parse_use_case_from_text(text: str) -> Optional[str]:
 
 def extract_chain_name_from_text(text: str) -> Optional[str]:
     """Try to extract a chain name from user input."""
-    # Pattern: "called X", "named X", "name is X", "name: X"
-    patterns = [
-        r"(?:called|named|name\s+is|name:)\s+[\"']?([a-zA-Z0-9\s]+)[\"']?",
-        r"^([A-Z][a-zA-Z0-9]+(?:\s+[A-Z][a-zA-Z0-9]+)*)",  # Title case words at start
-        r"^([a-zA-Z][a-zA-Z0-9]+)$",  # Single word name (any case)
-    ]
+    text = text.strip()
     
-    for pattern in patterns:
-        match = re.search(pattern, text.strip(), re.IGNORECASE)
-        if match:
-            name = match.group(1).strip()
-            if len(name) >= 2 and len(name) <= 50:
+    # Cheap screens first: the phrase pattern needs one of its trigger
+    # words, and the other patterns need the text to start with a letter
+    lowered = text.lower()
+    if "name" in lowered or "called" in lowered:
+        name = _match_chain_name(_CHAIN_NAME_PHRASE_RE, text)
+        if name:
+            return name
+    
+    if text[:1].isalpha():
+        for pattern in _CHAIN_NAME_START_PATTERNS:
+            name = _match_chain_name(pattern, text)
+            if name:
                 return name
     
     return None
 
 
+def _match_chain_name(pattern: re.Pattern, text: str) -> Optional[str]:
+    """Return the name captured by a chain-name pattern, if it has a valid length."""
+    match = pattern.search(text)
+    if match:
+        name = match.group(1).strip()
+        if len(name) >= 2 and len(name) <= 50:
+            return name
+    return None
+
+
+_WALLET_PHRASES = (
+    "my wallet", "connected wallet", "use my", "my address",
+    "current wallet", "this wallet", "same wallet",
+)
+
+
 def extract_wallet_intent(text: str) -> bool:
     """Check if user wants to use their connected wallet."""
     text = text.lower()
-    wallet_phrases = [
-        "my wallet", "connected wallet", "use my", "my address",
-        "current wallet", "this wallet", "same wallet",
-    ]
-    return any(phrase in text for phrase in wallet_phrases)
+    return any(phrase in text for phrase in _WALLET_PHRASES)